@@ -1,10 +1,15 @@
 # Python types
 from __future__ import annotations
+import contextlib
+import functools
 import io
+import operator
 import os.path
 import random
+import re
+import secrets
 import sys
-import datetime
+import typing
 
 # Web types
 from .forms import GenerateForm, RomForm
@@ -48,11 +53,92 @@ tech_order_map = {
     "balanced_random": rset.TechOrder.BALANCED_RANDOM
 }
 
+cosmetic_flag_map = {
+    "reduce_flashes": rset.CosmeticFlags.REDUCE_FLASH,
+    "zenan_alt_battle_music": rset.CosmeticFlags.ZENAN_ALT_MUSIC,
+    "death_peak_alt_music": rset.CosmeticFlags.DEATH_PEAK_ALT_MUSIC,
+    "quiet_mode": rset.CosmeticFlags.QUIET_MODE
+}
+
+# Form field and default name for each character/Epoch, in char_names order
+char_name_fields = (
+    ('crono_name', 'Crono'),
+    ('marle_name', 'Marle'),
+    ('lucca_name', 'Lucca'),
+    ('robo_name', 'Robo'),
+    ('frog_name', 'Frog'),
+    ('ayla_name', 'Ayla'),
+    ('magus_name', 'Magus'),
+    ('epoch_name', 'Epoch')
+)
+
+# In-game option form fields that map directly onto a boolean settings.ctoptions attribute
+ctoption_bool_fields = (
+    'stereo_audio',
+    'save_menu_cursor',
+    'save_battle_cursor',
+    'skill_item_info',
+    'consistent_paging'
+)
+
+# 1-based in-game option form fields and the 0-7 settings.ctoptions attribute they set
+ctoption_int_fields = (
+    ('battle_speed', 'battle_speed'),
+    ('background_selection', 'menu_background'),
+    ('battle_message_speed', 'battle_msg_speed')
+)
+
+# Valid character names are 1-5 ASCII letters/digits
+char_name_regex = re.compile(r'\A[A-Za-z0-9]{1,5}\Z')
+
+# OS-backed generator for seed names so they don't share the global random state
+_seed_rng = random.SystemRandom()
+
+# Seed name fragments, read from names.txt on first use by get_random_seed
+_seed_names: tuple[str, ...] | None = None
+
+# Vanilla ROM contents, read from disk on first use by get_base_rom
+_base_rom: bytes | None = None
+
 
 class InvalidSettingsException(Exception):
     pass
 
 
+# Rows of the web spoiler log tables
+class CharacterSpoiler(typing.NamedTuple):
+    location: str
+    character: str
+    reassign: str
+
+
+class KeyItemSpoiler(typing.NamedTuple):
+    location: str
+    key: str
+
+
+class BossSpoiler(typing.NamedTuple):
+    location: str
+    boss: str
+
+
+@contextlib.contextmanager
+def _seed_with_nonce(settings: rset.Settings, nonce: str):
+    """
+    Temporarily append a nonce to the seed value of the given settings object.
+    The original seed value is restored on exit, even if config generation fails.
+
+    :param settings: RandoSettings object whose seed should be modified
+    :param nonce: Nonce string to append to the seed
+    """
+    seed = settings.seed
+    settings.seed = seed + nonce
+    try:
+        yield
+    finally:
+        settings.seed = seed
+
+
 class RandomizerInterface:
     """
     RandomizerInterface acts as an interface between the web application
@@ -88,12 +174,10 @@ class RandomizerInterface:
         if form.cleaned_data['spoiler_log']:
             self.randomizer.set_random_config()
         else:
-            # Use the current timestamp's number of microseconds as an arbitrary nonce value
-            nonce = str(datetime.datetime.now().microsecond)
-            seed = self.randomizer.settings.seed
-            self.randomizer.settings.seed = seed + nonce
-            self.randomizer.set_random_config()
-            self.randomizer.settings.seed = seed
+            # Use a random hex string as an arbitrary nonce value
+            nonce = secrets.token_hex(4)
+            with _seed_with_nonce(self.randomizer.settings, nonce):
+                self.randomizer.set_random_config()
         return nonce
 
     def configure_seed_from_settings(self, settings: rset.Settings, is_race_seed: bool) -> str:
@@ -125,10 +209,9 @@ class RandomizerInterface:
         # the randomizer.  This will ensure that race ROMs and non-race ROMs with the same
         # seed value are not identical.
         if is_race_seed:
-            nonce = str(datetime.datetime.now().microsecond)
-            self.randomizer.settings.seed = new_seed + nonce
-            self.randomizer.set_random_config()
-            self.randomizer.settings.seed = new_seed
+            nonce = secrets.token_hex(4)
+            with _seed_with_nonce(self.randomizer.settings, nonce):
+                self.randomizer.set_random_config()
         else:
             self.randomizer.set_random_config()
         return nonce
@@ -152,57 +235,25 @@ class RandomizerInterface:
         :param form: RomForm with cosmetic settings
         """
         # Cosmetic settings
-        if form.cleaned_data['reduce_flashes']:
-            settings.cosmetic_flags = settings.cosmetic_flags | rset.CosmeticFlags.REDUCE_FLASH
-
-        if form.cleaned_data['zenan_alt_battle_music']:
-            settings.cosmetic_flags = settings.cosmetic_flags | rset.CosmeticFlags.ZENAN_ALT_MUSIC
-
-        if form.cleaned_data['death_peak_alt_music']:
-            settings.cosmetic_flags = settings.cosmetic_flags | rset.CosmeticFlags.DEATH_PEAK_ALT_MUSIC
-
-        if form.cleaned_data['quiet_mode']:
-            settings.cosmetic_flags = settings.cosmetic_flags | rset.CosmeticFlags.QUIET_MODE
+        settings.cosmetic_flags = functools.reduce(
+            operator.or_,
+            (flag for field, flag in cosmetic_flag_map.items() if form.cleaned_data[field]),
+            settings.cosmetic_flags)
 
         # Character/Epoch renames
-        settings.char_names[0] = self.get_character_name(form.cleaned_data['crono_name'], 'Crono')
-        settings.char_names[1] = self.get_character_name(form.cleaned_data['marle_name'], 'Marle')
-        settings.char_names[2] = self.get_character_name(form.cleaned_data['lucca_name'], 'Lucca')
-        settings.char_names[3] = self.get_character_name(form.cleaned_data['robo_name'], 'Robo')
-        settings.char_names[4] = self.get_character_name(form.cleaned_data['frog_name'], 'Frog')
-        settings.char_names[5] = self.get_character_name(form.cleaned_data['ayla_name'], 'Ayla')
-        settings.char_names[6] = self.get_character_name(form.cleaned_data['magus_name'], 'Magus')
-        settings.char_names[7] = self.get_character_name(form.cleaned_data['epoch_name'], 'Epoch')
+        for index, (field, default_name) in enumerate(char_name_fields):
+            settings.char_names[index] = self.get_character_name(form.cleaned_data[field], default_name)
 
         # In-game options
         # Boolean options
-        if form.cleaned_data['stereo_audio'] is not None:
-            settings.ctoptions.stereo_audio = form.cleaned_data['stereo_audio']
-
-        if form.cleaned_data['save_menu_cursor'] is not None:
-            settings.ctoptions.save_menu_cursor = form.cleaned_data['save_menu_cursor']
-
-        if form.cleaned_data['save_battle_cursor'] is not None:
-            settings.ctoptions.save_battle_cursor = form.cleaned_data['save_battle_cursor']
-
-        if form.cleaned_data['skill_item_info'] is not None:
-            settings.ctoptions.skill_item_info = form.cleaned_data['skill_item_info']
-
-        if form.cleaned_data['consistent_paging'] is not None:
-            settings.ctoptions.consistent_paging = form.cleaned_data['consistent_paging']
+        for field in ctoption_bool_fields:
+            if form.cleaned_data[field] is not None:
+                setattr(settings.ctoptions, field, form.cleaned_data[field])
 
         # Integer options
-        if form.cleaned_data['battle_speed']:
-            settings.ctoptions.battle_speed = \
-                self.clamp((form.cleaned_data['battle_speed'] - 1), 0, 7)
-
-        if form.cleaned_data['background_selection']:
-            settings.ctoptions.menu_background = \
-                self.clamp((form.cleaned_data['background_selection'] - 1), 0, 7)
-
-        if form.cleaned_data['battle_message_speed']:
-            settings.ctoptions.battle_msg_speed = \
-                self.clamp((form.cleaned_data['battle_message_speed'] - 1), 0, 7)
+        for field, option in ctoption_int_fields:
+            if form.cleaned_data[field]:
+                setattr(settings.ctoptions, option, self.clamp((form.cleaned_data[field] - 1), 0, 7))
 
         if form.cleaned_data['battle_gauge_style'] is not None:
             settings.ctoptions.battle_gauge_style = \
@@ -434,77 +485,83 @@ class RandomizerInterface:
     # End __convert_form_to_settings
 
     @classmethod
-    def get_spoiler_log(cls, config: randoconfig.RandoConfig, settings: rset.Settings) -> io.StringIO:
+    def get_spoiler_log(cls, config: randoconfig.RandoConfig, settings: rset.Settings) -> io.BytesIO:
         """
         Get a spoiler log file-like object.
 
         :param config: RandoConfig object describing the seed
         :param settings: RandoSettings object describing the seed
-        :return: File-like object with spoiler log data for the given seed data
+        :return: Byte buffer with UTF-8 spoiler log data for the given seed data
         """
-        spoiler_log = io.StringIO()
+        spoiler_log = io.BytesIO()
         rando = randomizer.Randomizer(cls.get_base_rom(), is_vanilla=True, settings=settings, config=config)
 
-        # The Randomizer.write_spoiler_log method writes directly to a file,
-        # but it works if we pass a StringIO instead.
-        rando.write_spoiler_log(spoiler_log)
+        # The Randomizer.write_spoiler_log method writes text directly to a file.
+        # Encode it straight into a byte buffer so the HTTP response doesn't need to
+        # encode the whole log again, then detach the wrapper so it doesn't close the buffer.
+        text_log = io.TextIOWrapper(spoiler_log, encoding='utf-8', newline='', write_through=True)
+        rando.write_spoiler_log(text_log)
+        text_log.detach()
 
         return spoiler_log
 
     @classmethod
-    def get_json_spoiler_log(cls, config: randoconfig.RandoConfig, settings: rset.Settings) -> io.StringIO:
+    def get_json_spoiler_log(cls, config: randoconfig.RandoConfig, settings: rset.Settings) -> io.BytesIO:
         """
         Get a spoiler log file-like object.
 
         :param config: RandoConfig object describing the seed
         :param settings: RandoSettings object describing the seed
-        :return: File-like object with spoiler log data for the given seed data
+        :return: Byte buffer with UTF-8 spoiler log data for the given seed data
         """
-        spoiler_log = io.StringIO()
+        spoiler_log = io.BytesIO()
         rando = randomizer.Randomizer(cls.get_base_rom(), is_vanilla=True, settings=settings, config=config)
 
-        # The Randomizer.write_spoiler_log method writes directly to a file,
-        # but it works if we pass a StringIO instead.
-        rando.write_json_spoiler_log(spoiler_log)
+        # The Randomizer.write_json_spoiler_log method writes text directly to a file.
+        # Encode it straight into a byte buffer so the HTTP response doesn't need to
+        # encode the whole log again, then detach the wrapper so it doesn't close the buffer.
+        text_log = io.TextIOWrapper(spoiler_log, encoding='utf-8', newline='', write_through=True)
+        rando.write_json_spoiler_log(text_log)
+        text_log.detach()
 
         return spoiler_log
 
     @staticmethod
-    def get_web_spoiler_log(config: randoconfig.RandoConfig) -> dict[str, list[dict[str, str]]]:
+    def get_web_spoiler_log(config: randoconfig.RandoConfig) -> dict[str, list[tuple[str, ...]]]:
         """
         Get a dictionary representing the spoiler log data for the given seed.
 
         :param config: RandoConfig object describing the seed
-        :return: Dictionary of spoiler data
+        :return: Dictionary of spoiler data, one list of row tuples per table
         """
-        spoiler_log = {
-            'characters': [],
-            'key_items': [],
-            'bosses': []
-        }
+        spoiler_log = {}
 
         # Character data
-        for recruit_spot in config.char_assign_dict.keys():
-            held_char = config.char_assign_dict[recruit_spot].held_char
-            char_data = {'location': str(f"{recruit_spot}"),
-                         'character': str(f"{held_char}"),
-                         'reassign': str(f"{config.char_manager.pcs[held_char].assigned_char}")}
-            spoiler_log['characters'].append(char_data)
+        spoiler_log['characters'] = [
+            CharacterSpoiler(location=str(recruit_spot),
+                             character=str(assignment.held_char),
+                             reassign=str(config.char_manager.pcs[assignment.held_char].assigned_char))
+            for recruit_spot, assignment in config.char_assign_dict.items()
+        ]
 
         # Key item data
-        for location in config.key_item_locations:
-            spoiler_log['key_items'].append(
-                {'location': str(f"{location.getName()}"), 'key': str(location.getKeyItem())})
+        spoiler_log['key_items'] = [
+            KeyItemSpoiler(location=str(location.getName()), key=str(location.getKeyItem()))
+            for location in config.key_item_locations
+        ]
 
         # Boss data
-        for location in config.boss_assign_dict.keys():
-            if config.boss_assign_dict[location] == ctenums.BossID.TWIN_BOSS:
-                twin_type = config.boss_data_dict[ctenums.BossID.TWIN_BOSS].scheme.ids[0]
-                twin_name = config.enemy_dict[twin_type].name
-                boss_str = "Twin " + str(twin_name)
-            else:
-                boss_str = str(config.boss_assign_dict[location])
-            spoiler_log['bosses'].append({'location': str(location), 'boss': boss_str})
+        # The twin boss's name depends on which enemy it was built from, so look it up once
+        twin_boss = ctenums.BossID.TWIN_BOSS
+        twin_str = None
+        if twin_boss in config.boss_assign_dict.values():
+            twin_type = config.boss_data_dict[twin_boss].scheme.ids[0]
+            twin_str = "Twin " + str(config.enemy_dict[twin_type].name)
+
+        spoiler_log['bosses'] = [
+            BossSpoiler(location=str(location), boss=twin_str if boss == twin_boss else str(boss))
+            for location, boss in config.boss_assign_dict.items()
+        ]
 
         return spoiler_log
     # End get_web_spoiler_log
@@ -515,13 +572,15 @@ class RandomizerInterface:
         Get a random seed string for a ROM.
         This seed string is built up from a list of names bundled with the randomizer.  This method
         expects the names.txt file to be accessible in the web app's root directory.
+        The file is only read once per process.
 
         :return: Random seed string.
         """
-        with open("names.txt", "r") as names_file:
-            names = names_file.readline()
-            names = names.split(",")
-        return "".join(random.choice(names) for i in range(2))
+        global _seed_names
+        if _seed_names is None:
+            with open("names.txt", "r") as names_file:
+                _seed_names = tuple(names_file.readline().split(","))
+        return "".join(_seed_rng.choices(_seed_names, k=2))
 
     @staticmethod
     def get_base_rom() -> bytearray:
@@ -532,13 +591,16 @@ class RandomizerInterface:
         be used for that process instead.
 
         The unheadered, vanilla Chrono Trigger ROM must be located in the web app's BASE_DIR
-        and must be named ct.sfc.
+        and must be named ct.sfc.  The file is only read once per process; each call returns
+        a fresh copy since the randomizer modifies the data it is given.
 
         :return: bytearray containing the vanilla Chrono Trigger ROM data
         """
-        with open(str("ct.sfc"), 'rb') as infile:
-            rom = bytearray(infile.read())
-        return rom
+        global _base_rom
+        if _base_rom is None:
+            with open(str("ct.sfc"), 'rb') as infile:
+                _base_rom = infile.read()
+        return bytearray(_base_rom)
 
     @classmethod
     def get_share_details(cls, config: randoconfig.RandoConfig, settings: rset.Settings) -> io.StringIO:
@@ -575,15 +637,15 @@ class RandomizerInterface:
         Given a character name and a default, validate the name and return either the
         validated name or the default value if the name is invalid.
 
-        Valid names are five characters or less, alphanumeric characters only.
+        Valid names are five characters or less, ASCII alphanumeric characters only.
 
         :param name: Name selected by the user
         :param default_name: Default name of the character
         :return: Either the user's selected name or a default if the name is invalid.
         """
-        if name is None or name == "" or len(name) > 5 or not name.isalnum():
-            return default_name
-        return name
+        if name and char_name_regex.match(name):
+            return name
+        return default_name
 
     @staticmethod
     def clamp(value, min_val, max_val):